@@ -17,7 +17,7 @@ class AbstractArchimedeanCopula(BaseCopula[float], ABC):
     @shape_first_input_to_cop_dim
     @squeeze_output
     def cdf(self, x: Array, log=False) -> np.ndarray:
-        cdf = self.psi(self.ipsi(x).sum(1))
+        cdf = self.psi(self._ipsi_sum(x))
         return np.log(cdf) if log else cdf
 
     @validate_data_dim({"u": [1, 2]})
@@ -67,6 +67,14 @@ class AbstractArchimedeanCopula(BaseCopula[float], ABC):
         """
         pass
 
+    def _ipsi_sum(self, u: np.ndarray) -> np.ndarray:
+        """
+        Sum of the inverse generator over the columns of the (n x d) matrix u. Copulae whose inverse generator
+        has a simple closed form should override this to compute the row sums without the intermediate steps
+        of :meth:`ipsi`
+        """
+        return self.ipsi(u).sum(1)
+
     @cast_input(['rho'])
     @squeeze_output
     def irho(self, rho):
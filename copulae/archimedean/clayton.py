@@ -73,8 +73,12 @@ class ClaytonCopula(AbstractArchimedeanCopula):
     @cast_input(['u'])
     @squeeze_output
     def ipsi(self, u: Array, log=False):
-        v = np.sign(self._theta) * (u ** -self._theta - 1)
-        return np.log(v) if log else v
+        # operations are done in place on a single copy of u to avoid allocating temporary arrays
+        v = u.astype(float)
+        v **= -self._theta
+        v -= 1
+        v *= np.sign(self._theta)
+        return np.log(v, out=v) if log else v
 
     @cast_input(['tau'])
     @squeeze_output
@@ -121,7 +125,7 @@ class ClaytonCopula(AbstractArchimedeanCopula):
             return log_pdf
 
         lu = np.log(u).sum(1)
-        t = self.ipsi(u).sum(1)
+        t = self._ipsi_sum(u)
 
         if theta < 0:  # dim == 2
             pos_t = t < 1
@@ -137,7 +141,12 @@ class ClaytonCopula(AbstractArchimedeanCopula):
     @cast_input(['s'])
     @squeeze_output
     def psi(self, s: Array):
-        return np.maximum(1 + np.sign(self._theta) * s, np.zeros_like(s)) ** (-1 / self._theta)
+        v = s.astype(float)
+        v *= np.sign(self._theta)
+        v += 1
+        np.maximum(v, 0, out=v)
+        v **= -1 / self._theta
+        return v
 
     @cast_output
     def random(self, n: int, seed: int = None) -> np.ndarray:
@@ -168,6 +177,10 @@ class ClaytonCopula(AbstractArchimedeanCopula):
     def tau(self):
         return self._tau(self.params)
 
+    def _ipsi_sum(self, u: np.ndarray) -> np.ndarray:
+        # sum(sign * (u^-theta - 1)) == sign * (sum(u^-theta) - d)
+        return np.sign(self._theta) * ((u ** -self._theta).sum(1) - u.shape[1])
+
     @staticmethod
     def _rho(theta):
         # TODO Clayton: add rho function
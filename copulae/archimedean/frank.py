@@ -156,7 +156,13 @@ class FrankCopula(AbstractArchimedeanCopula):
         if self.params <= -36:
             return -log1pexp(-s - self.params) / self.params
         elif self.params < 0:
-            return -np.log1p(np.exp(-s) * np.expm1(-self.params)) / self.params
+            v = s.astype(float)
+            np.negative(v, out=v)
+            np.exp(v, out=v)
+            v *= np.expm1(-self.params)
+            np.log1p(v, out=v)
+            v /= -self.params
+            return v
         elif self.params == 0:
             return np.exp(-s)
         else:
@@ -148,8 +148,12 @@ class GumbelCopula(AbstractArchimedeanCopula):
     @cast_input(['u'])
     @squeeze_output
     def ipsi(self, u: Array, log=False):
-        v = (-np.log(u)) ** self.params
-        return np.log(v) if log else v
+        # operations are done in place on a single copy of u to avoid allocating temporary arrays
+        v = u.astype(float)
+        np.log(v, out=v)
+        np.negative(v, out=v)
+        v **= self.params
+        return np.log(v, out=v) if log else v
 
     @cast_input(['tau'])
     @squeeze_output
@@ -222,7 +226,10 @@ class GumbelCopula(AbstractArchimedeanCopula):
     @cast_input(['s'])
     @squeeze_output
     def psi(self, s: Array) -> np.ndarray:
-        return np.exp(-s ** (1 / self.params))
+        v = s.astype(float)
+        v **= 1 / self.params
+        np.negative(v, out=v)
+        return np.exp(v, out=v)
 
     @cast_output
     def random(self, n: int, seed: int = None):
@@ -2,9 +2,20 @@ from typing import Optional
 
 import numpy as np
 
-from ._distribution import emp_copula_dist
+from ._distribution import (bit_set_emp_copula_count, bivariate_emp_copula_count, checkerboard_emp_copula_dist,
+                            emp_copula_dist, prefix_bit_sets)
 
-__all__ = ["emp_dist_func"]
+__all__ = ["emp_checkerboard_ranks", "emp_copula_index", "emp_dist_func", "EmpCopulaIndex"]
+
+_SMOOTHING_CODES = {
+    "none": 0,
+    "beta": 1,
+    "checkerboard": 2,
+}
+"""Codes of the smoothing methods used by the empirical copula distribution kernels"""
+
+_MAX_BITSET_WORDS = 2 ** 23
+"""Maximum number of 64 bit words (64MB) used by the bit sets when counting the multivariate empirical copula"""
 
 
 def emp_dist_func(x: np.ndarray, y: np.ndarray, smoothing: Optional[str] = "none", offset: float = 0.0):
@@ -40,18 +51,132 @@ def emp_dist_func(x: np.ndarray, y: np.ndarray, smoothing: Optional[str] = "none
     assert np.ndim(x) == 2 and np.ndim(y) == 2, "input data must be matrices"
     assert x.shape[1] == y.shape[1], "input data must have the same dimensions"
 
+    if smoothing == 0:
+        index = emp_copula_index(y)
+        if index is not None:
+            return index.count(x) / (len(y) + offset)
+
+    if smoothing == 2:
+        ranks = emp_checkerboard_ranks(y)
+        if ranks is not None:
+            return checkerboard_emp_copula_dist(np.ascontiguousarray(x), ranks, offset)
+
     return emp_copula_dist(x, y, offset, smoothing)
 
 
+def emp_copula_index(y: np.ndarray) -> Optional["EmpCopulaIndex"]:
+    """
+    Creates an index over the data points to evaluate the empirical copula (no smoothing). Returns None if
+    the index would take too much memory, in which case the data points should be scanned directly.
+
+    Parameters
+    ----------
+    y
+        Matrix of data points forming the empirical distribution
+
+    Returns
+    -------
+    EmpCopulaIndex, optional
+        Index over the data points
+    """
+    n, d = np.shape(y)
+    if d != 2 and d * (n + 1) * ((n + 63) // 64) > _MAX_BITSET_WORDS:
+        return None
+    return EmpCopulaIndex(y)
+
+
+class EmpCopulaIndex:
+    """
+    Index over the data points forming an empirical copula which counts, for any evaluation point, the number
+    of data points less than or equal to it in every dimension.
+
+    For every dimension, the data points less than or equal to an evaluation point are the first few data points
+    in sorted order, so each evaluation point is reduced to the number of these data points per dimension. In
+    the bivariate case, the data points are then counted with a sweep in O((n + m) log n) time. Otherwise, they
+    are counted from the intersection of bit sets built for every prefix of the sorted data points. Building the
+    index sorts the data points, so it should be kept when evaluating against the same data points repeatedly.
+    """
+
+    def __init__(self, y: np.ndarray):
+        y = np.asarray(y, float)
+        self._n, self._dim = y.shape
+
+        order = np.argsort(y, axis=0, kind='mergesort')
+        self._sorted = np.take_along_axis(y, order, axis=0)
+
+        if self._dim == 2:
+            ranks = self._ranks(y)
+            ranks[np.isnan(y)] = self._n + 1  # nan data points are never counted
+            self._y_ranks = np.ascontiguousarray(ranks[order[:, 0]])  # sweep order, nan sorted last
+        else:
+            self._prefix = prefix_bit_sets(np.ascontiguousarray(order.T, np.int64))
+
+    def count(self, x: np.ndarray) -> np.ndarray:
+        """
+        Counts the number of data points less than or equal to each evaluation point
+
+        Parameters
+        ----------
+        x
+            Matrix of evaluation points
+
+        Returns
+        -------
+        ndarray
+            Number of data points less than or equal to each evaluation point
+        """
+        x = np.asarray(x, float)
+        ranks = self._ranks(x)
+        ranks[np.isnan(x)] = 0  # comparisons against nan are always False
+
+        if self._dim == 2:
+            return bivariate_emp_copula_count(ranks, self._y_ranks)
+        return bit_set_emp_copula_count(ranks, self._prefix)
+
+    def _ranks(self, x: np.ndarray):
+        """Number of data points less than or equal to each value in its column"""
+        ranks = np.empty(x.shape, np.int64)
+        for j in range(self._dim):
+            ranks[:, j] = np.searchsorted(self._sorted[:, j], x[:, j], 'right')
+        return ranks
+
+
+def emp_checkerboard_ranks(y: np.ndarray) -> Optional[np.ndarray]:
+    """
+    The checkerboard copula only uses the data points through (n + 1) * y, which are the integer ranks when
+    y are the pseudo-observations without average ties. Returns these ranks as 16 bit integers if they are
+    integers that fit in 16 bits and None otherwise, in which case the data points should be scanned directly.
+
+    Parameters
+    ----------
+    y
+        Matrix of data points forming the empirical distribution
+
+    Returns
+    -------
+    ndarray, optional
+        Integer ranks of the data points
+    """
+    n = len(y)
+    if n >= np.iinfo(np.uint16).max:
+        return None
+
+    ranks = y * (n + 1)
+    grid = np.rint(ranks)
+    if not np.all(np.abs(ranks - grid) <= 1e-8):  # also fails on nan
+        return None
+
+    if not np.all((grid >= 0) & (grid <= np.iinfo(np.uint16).max)):  # would wrap around when cast
+        return None
+
+    return np.ascontiguousarray(grid, np.uint16)
+
+
 def _map_smoothing(smoothing: Optional[str]):
     if smoothing is None:
         smoothing = "none"
 
-    res = {
-        "none": 0,
-        "beta": 1,
-        "checkerboard": 2,
-    }.get(smoothing.lower(), None)
+    res = _SMOOTHING_CODES.get(smoothing.lower(), None)
     assert res is not None, "smoothing must be 'beta', 'checkerboard' or None"
 
     return res
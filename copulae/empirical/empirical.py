@@ -1,9 +1,11 @@
-from typing import Optional, Union
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple, Union
 from warnings import warn
 
 import numpy as np
 import pandas as pd
-from scipy.stats import beta
+from scipy.special import betaln
 
 from copulae.copula import BaseCopula
 from copulae.copula import Summary
@@ -11,7 +13,8 @@ from copulae.core import rank_data
 from copulae.special import log_sum
 from copulae.types import Array, EPSILON, Matrix, Ties
 from copulae.utility.annotations import *
-from .distribution import emp_dist_func
+from ._distribution import checkerboard_emp_copula_dist
+from .distribution import EmpCopulaIndex, emp_checkerboard_ranks, emp_copula_index, emp_dist_func
 
 try:
     from typing import Literal
@@ -20,6 +23,16 @@ except ImportError:
 
 Smoothing = Literal['none', 'beta', 'checkerboard']
 
+_PDF_BLOCK_SIZE = 2 ** 20
+"""Number of elements in the blocks of beta kernels evaluated at a time by EmpiricalCopula.pdf"""
+
+_PDF_WORKERS = (len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity")
+                else os.cpu_count() or 1)
+"""
+Number of threads evaluating the blocks of beta kernels, which share the elements of _PDF_BLOCK_SIZE. These
+are the cores the process may run on, which can be far fewer than the cores of the host in a container.
+"""
+
 
 class EmpiricalCopula(BaseCopula[None]):
     """
@@ -94,6 +107,9 @@ class EmpiricalCopula(BaseCopula[None]):
         self._offset = offset
         self.smoothing = smoothing
         self._data = data
+        self._data_np = np.asarray(data)
+        self._data_sorted = np.sort(self._data_np, axis=0)  # each margin sorted, used to map back to margins
+        self._rng = np.random.default_rng()
         super().__init__(data.shape[1], "Empirical")
 
         if isinstance(data, pd.DataFrame):
@@ -128,11 +144,24 @@ class EmpiricalCopula(BaseCopula[None]):
         ndarray or float
             The CDF of the random variates
         """
-        if np.any(u > (1 + EPSILON)) or np.any(u < -EPSILON):
+        u = np.asarray(u, float)
+        # fmin and fmax skip nan values just like the comparisons did, without creating boolean masks
+        if u.size > 0 and (np.fmin.reduce(u, axis=None) < -EPSILON or np.fmax.reduce(u, axis=None) > 1 + EPSILON):
             raise ValueError("input array must be pseudo observations")
 
-        uu = self.pobs(self._data, self.ties)  # pseudo-observations of source marginal to compare against
-        cdf = emp_dist_func(u, uu, self._smoothing, self._offset)
+        if self._uu is None:
+            self._uu = self.pobs(self._data_np, self.ties)  # pseudo-observations of source marginal to compare against
+            if self._smoothing == "none":
+                self._uu_index = emp_copula_index(self._uu)  # None if the data set is too large to be indexed
+            elif self._smoothing == "checkerboard":
+                self._uu_ranks = emp_checkerboard_ranks(self._uu)  # None if the ranks are not 16 bit integers
+
+        if self._uu_index is not None:
+            cdf = self._uu_index.count(u) / (len(self._uu) + self._offset)
+        elif self._uu_ranks is not None:
+            cdf = checkerboard_emp_copula_dist(np.ascontiguousarray(u), self._uu_ranks, self._offset)
+        else:
+            cdf = emp_dist_func(u, self._uu, self._smoothing, self._offset)
         return np.log(cdf) if log else cdf
 
     def fit(self, data, x0=None, method='ml', optim_options=None, ties='average', verbose=1):
@@ -153,31 +182,37 @@ class EmpiricalCopula(BaseCopula[None]):
         assert self.smoothing == "beta", "Empirical Copula only has density (PDF) for 'beta' smoothing"
         u = self.pobs(u, self.ties)
 
-        data_rank = rank_data(self.data, 1, self.ties)
         n = len(self.data)
 
-        if log:
-            return np.array([
-                log_sum(
-                    np.array([
-                        sum(beta.logpdf(row, a=row_rank, b=n + 1 - row_rank))
-                        for row_rank in data_rank
-                    ])
-                ) for row in u]) - np.log(n + self._offset)
-        else:
-            return np.array([
-                sum([
-                    np.prod(beta.pdf(row, a=row_rank, b=n + 1 - row_rank))
-                    for row_rank in data_rank
-                ]) for row in u]) / (n + self._offset)
+        if self._beta_params is None:
+            data_rank = rank_data(self._data_np, 1, self.ties)
+            a, b = data_rank - 1, n - data_rank
+            self._beta_params = a, b, betaln(a + 1, b + 1)
+
+        lu, l1u = np.log(u), np.log1p(-u)
+
+        # the kernels are evaluated on blocks of rows of u to bound the memory of the (rows x n x d) array,
+        # where the blocks in flight on all threads together hold at most _PDF_BLOCK_SIZE elements
+        log_pdf = np.empty(len(u))
+        step = max(1, _PDF_BLOCK_SIZE // (_PDF_WORKERS * self._beta_params[2].size))
+        blocks = [slice(i, i + step) for i in range(0, len(u), step)]
+
+        if len(blocks) == 1:
+            log_pdf[:] = self._log_beta_kernel_sum(lu, l1u)
+        elif len(blocks) > 1:  # there are no blocks when u is empty
+            # numpy releases the GIL while evaluating the kernels, so the blocks are evaluated concurrently
+            with ThreadPoolExecutor(min(_PDF_WORKERS, len(blocks))) as executor:
+                sums = executor.map(lambda rows: self._log_beta_kernel_sum(lu[rows], l1u[rows]), blocks)
+                for rows, res in zip(blocks, sums):
+                    log_pdf[rows] = res
+
+        log_pdf -= np.log(n + self._offset)
+        return log_pdf if log else np.exp(log_pdf)
 
     @cast_output
     def random(self, n: int, seed: int = None):
-        if seed is not None:
-            np.random.seed(seed)
-
-        data = np.asarray(self.data)
-        return self._format_output(data[np.random.randint(0, len(data), n)])
+        rng = self._rng if seed is None else np.random.default_rng(seed)
+        return self._format_output(self._data_np[rng.integers(0, len(self._data_np), n)])
 
     @property
     def smoothing(self):
@@ -198,6 +233,7 @@ class EmpiricalCopula(BaseCopula[None]):
 
         assert smoothing in ("none", "beta", "checkerboard"), "Smoothing must be 'none', 'beta' or 'checkerboard'"
         self._smoothing = smoothing
+        self._reset_cache()
 
     def summary(self):
         return Summary(self, {
@@ -226,13 +262,12 @@ class EmpiricalCopula(BaseCopula[None]):
         """
         # because it is pseudo-observations, and already ranked within the columns, we can just
         # multiply by the number of rows in the original data set to get the position rank
-        index = np.floor(u * len(self.data)).astype(int)
-        data = np.array(self.data)
-        source = np.take_along_axis(np.array(data), data.argsort(axis=0), axis=0)
+        n = len(self._data_np)
+        index = np.clip(np.floor(u * n).astype(np.intp), 0, n - 1)
 
         # marginals derived row by row based on 'lowest' position, we could offer an interpolation in
         # the future, but not sure how popular this method is
-        marginals = np.transpose([source[r, c] for c, r in enumerate(index.T)])
+        marginals = np.take_along_axis(self._data_sorted, index, axis=0)
         return self._format_output(marginals)
 
     @property
@@ -260,6 +295,24 @@ class EmpiricalCopula(BaseCopula[None]):
     @ties.setter
     def ties(self, value: Ties):
         self._ties = value
+        self._reset_cache()
+
+    def _log_beta_kernel_sum(self, lu: np.ndarray, l1u: np.ndarray):
+        """
+        Log of the sum of the beta kernel densities of all data points, given the logs of u and 1 - u
+
+        The densities are summed in log space so that they cannot underflow before being added
+        """
+        a, b, log_beta = self._beta_params
+        kernel = (a[None, :, :] * lu[:, None, :] + b[None, :, :] * l1u[:, None, :] - log_beta).sum(2)
+        return log_sum(kernel.T)
+
+    def _reset_cache(self):
+        """Clears the values derived from the ranks of the data set, which depend on the ties and smoothing methods"""
+        self._uu: Optional[np.ndarray] = None
+        self._uu_index: Optional[EmpCopulaIndex] = None
+        self._uu_ranks: Optional[np.ndarray] = None
+        self._beta_params: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
 
     def _format_output(self, output: np.ndarray):
         """Converts output array to DataFrame if the input data is a DataFrame"""
@@ -367,7 +367,7 @@ def stirling_first_all(n: int):
         A vector of all the Stirling number of the first kind
 
     """
-    return [stirling_first(n, k + 1) for k in range(n)]
+    return _stirling_row(n, first_kind=True)[1:]
 
 
 def stirling_second(n: int, k: int):
@@ -422,4 +422,26 @@ def stirling_second_all(n: int):
     list of int
         A vector of all the Stirling number of the second kind
     """
-    return [stirling_second(n, k + 1) for k in range(n)]
+    return _stirling_row(n, first_kind=False)[1:]
+
+
+def _stirling_row(n: int, first_kind: bool):
+    """
+    Computes the Stirling numbers for k = 0, ..., n with a single pass of the recurrence relation. Python
+    integers are used so that the numbers are exact regardless of how large they get
+    """
+    try:
+        n = int(n)
+    except (ValueError, TypeError):
+        raise TypeError("`n` must be an integer")
+
+    row = [1]
+    for i in range(n):
+        # lower[k] = S(i, k - 1) and upper[k] = S(i, k), the terms used to derive S(i + 1, k)
+        lower, upper = [0, *row], [*row, 0]
+        if first_kind:
+            row = [lo - i * up for lo, up in zip(lower, upper)]
+        else:
+            row = [lo + k * up for k, (lo, up) in enumerate(zip(lower, upper))]
+
+    return row
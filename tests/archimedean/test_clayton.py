@@ -159,6 +159,13 @@ def test_psi(copula, U5):
     assert_array_almost_equal(psi, target, 3)
 
 
+def test_psi_ipsi_scalar_keyword(copula):
+    theta = copula.params
+    assert_almost_equal(copula.psi(s=0.5), (1 + 0.5) ** (-1 / theta))
+    assert_almost_equal(copula.ipsi(u=0.5), 0.5 ** -theta - 1)
+    assert_almost_equal(copula.ipsi(u=0.5, log=True), np.log(0.5 ** -theta - 1))
+
+
 def test_gaussian_random_generates_correctly(copula):
     assert copula.random(5000).shape == (5000, copula.dim)
 
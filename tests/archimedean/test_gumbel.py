@@ -93,6 +93,12 @@ def test_gumbel_dipsi(copula, U5, degree, log, expected):
         assert_array_almost_equal(copula.dipsi(U5, degree, log), expected, 4)
 
 
+def test_gumbel_psi_ipsi_scalar_keyword(copula):
+    theta = copula.params
+    assert_almost_equal(copula.psi(s=0.5), np.exp(-0.5 ** (1 / theta)))
+    assert_almost_equal(copula.ipsi(u=0.5), (-np.log(0.5)) ** theta)
+
+
 def test_gumbel_fit(fitted_gumbel):
     assert_almost_equal(fitted_gumbel.params, 1.171789, 5)
 
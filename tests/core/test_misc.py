@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_almost_equal
+from scipy import stats
+
+from copulae.core import rank_data
+
+
+@pytest.mark.parametrize("n", [10, 40, 500, 5000])
+@pytest.mark.parametrize("axis", [0, 1])
+@pytest.mark.parametrize("ties", ["average", "min", "max", "dense", "ordinal"])
+def test_rank_data(n, axis, ties):
+    obs = np.random.RandomState(8).normal(size=(n, 4)).round(1)  # rounding introduces ties
+    if axis == 0:
+        obs = obs.T
+
+    expected = np.apply_along_axis(stats.rankdata, 1 - axis, obs, ties)
+    ranks = rank_data(obs, axis, ties)
+
+    assert ranks.dtype == expected.dtype
+    assert_almost_equal(ranks, expected)
+
+
+@pytest.mark.parametrize("shape, axis", [((0, 3), 1), ((3, 0), 0)])
+@pytest.mark.parametrize("ties", ["average", "min", "ordinal"])
+@pytest.mark.parametrize("dtype", [float, int])
+def test_rank_data_empty(shape, axis, ties, dtype):
+    assert rank_data(np.empty(shape, dtype), axis, ties).shape == shape
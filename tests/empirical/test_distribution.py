@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_almost_equal
+
+from copulae.empirical.distribution import emp_dist_func
+
+
+@pytest.fixture(scope="module")
+def data():
+    return np.random.RandomState(8).uniform(size=(20, 2))
+
+
+def test_emp_dist_func_beta_propagates_nan(data):
+    # the first dimension has no data points below it, the nan must not be skipped
+    assert np.isnan(emp_dist_func([[0.0, np.nan]], data, "beta")).all()
+
+
+@pytest.mark.parametrize("y", [
+    [[-0.25], [0.25], [0.5]],  # on the rank grid but negative
+    np.random.RandomState(8).randint(0, 1000, (300, 1)),  # on the rank grid but beyond 16 bits
+])
+def test_emp_dist_func_checkerboard_outside_rank_grid(y):
+    y = np.asarray(y, float)
+    x = np.array([[0.1], [0.5], [0.9], [500.0]])
+
+    n = len(y)
+    expected = np.clip(n * x[:, None, :] + 1 - (n + 1) * y[None, :, :], 0, 1).prod(2).sum(1) / n
+
+    assert_almost_equal(emp_dist_func(x, y, "checkerboard"), expected)
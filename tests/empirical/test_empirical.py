@@ -1,3 +1,5 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import pytest
 from numpy.testing import assert_almost_equal
@@ -5,6 +7,7 @@ from numpy.testing import assert_almost_equal
 from copulae import EmpiricalCopula, pseudo_obs
 from copulae.copula import Summary
 from copulae.datasets import load_marginal_data, load_smi
+from copulae.empirical import empirical
 
 
 @pytest.fixture
@@ -55,6 +58,76 @@ def test_empirical_pdf(smi, u, log):
     assert_almost_equal(pdf, expected, decimal=6)
 
 
+@pytest.mark.parametrize("log", [True, False])
+def test_empirical_pdf_blocks(smi, u, log, monkeypatch):
+    cop = EmpiricalCopula(smi, smoothing="beta")
+    expected = cop.pdf(u, log)
+
+    # the 2 workers can only hold 2 rows of u together, so every row is evaluated in its own block
+    monkeypatch.setattr(empirical, "_PDF_BLOCK_SIZE", 2 * smi.size)
+    monkeypatch.setattr(empirical, "_PDF_WORKERS", 2)
+
+    blocks, executors = [], []
+    kernel_sum = cop._log_beta_kernel_sum
+    monkeypatch.setattr(cop, "_log_beta_kernel_sum",
+                        lambda lu, l1u: blocks.append(len(lu)) or kernel_sum(lu, l1u))
+    monkeypatch.setattr(empirical, "ThreadPoolExecutor",
+                        lambda *args: executors.append(args) or ThreadPoolExecutor(*args))
+
+    assert_almost_equal(cop.pdf(u, log), expected)
+    assert blocks == [1] * len(u)
+    assert executors == [(2,)]
+
+
+@pytest.mark.parametrize("log", [True, False])
+def test_empirical_pdf_empty(smi, log):
+    cop = EmpiricalCopula(smi, smoothing="beta")
+    assert cop.pdf(np.empty((0, smi.shape[1])), log).shape == (0,)
+
+
+def test_empirical_bivariate_cdf(smi):
+    data = smi.iloc[:, :2].round(1)  # rounding introduces ties into the data set
+    cop = EmpiricalCopula(data)
+
+    uu = pseudo_obs(data)
+    u = np.vstack([uu[:10], np.random.RandomState(8).uniform(size=(10, 2))])
+    expected = (uu[None, :, :] <= u[:, None, :]).all(2).mean(1)
+
+    assert_almost_equal(cop.cdf(u), expected)
+
+
+@pytest.mark.parametrize("ties", ["average", "ordinal"])
+def test_empirical_checkerboard_cdf(smi, u, ties):
+    cop = EmpiricalCopula(smi, smoothing="checkerboard", ties=ties)
+
+    n = len(smi)
+    ranks = pseudo_obs(smi, ties) * (n + 1)
+    expected = np.clip(n * u[:, None, :] + 1 - ranks[None, :, :], 0, 1).prod(2).sum(1) / n
+
+    assert_almost_equal(cop.cdf(u), expected)
+
+
+def test_empirical_ties_change_resets_cache(u):
+    data = load_smi().iloc[:, :4].round(1)  # rounding introduces ties into the data set
+    cop = EmpiricalCopula(data, smoothing="beta")
+    cdf, pdf = cop.cdf(u), cop.pdf(u)
+
+    cop.ties = "min"
+    expected = EmpiricalCopula(data, smoothing="beta", ties="min")
+    assert_almost_equal(cop.cdf(u), expected.cdf(u))
+    assert_almost_equal(cop.pdf(u), expected.pdf(u))
+    assert not np.allclose(cop.cdf(u), cdf)
+    assert not np.allclose(cop.pdf(u), pdf)
+
+
+def test_empirical_smoothing_change_resets_cache(smi, u):
+    cop = EmpiricalCopula(smi)
+    cop.cdf(u)
+
+    cop.smoothing = "checkerboard"
+    assert_almost_equal(cop.cdf(u), EmpiricalCopula(smi, smoothing="checkerboard").cdf(u))
+
+
 def test_empirical_param_returns_none(smi):
     cop = EmpiricalCopula(smi)
     assert cop.params is None
@@ -66,6 +139,8 @@ def test_empirical_random(smi, seed):
     rvs = cop.random(5, seed)
 
     assert rvs.shape == (5, smi.shape[1])
+    if seed is not None:
+        assert_almost_equal(np.asarray(rvs), np.asarray(cop.random(5, seed)))
 
 
 def test_empirical_summary(smi):